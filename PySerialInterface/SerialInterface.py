@@ -4,44 +4,39 @@
 Serial communication interface
 """
 import time
-from asyncio import QueueEmpty
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
 import logging
 from logging import getLogger
 from typing import Union, List
-from queue import Queue, Empty
+import threading
 from threading import Thread
-from dataclasses_json import dataclass_json
 from serial import Serial, SerialException
 from PySerialInterface.SerialRequest import Event, CLIResponseMessage, SerialRequest, EmptyMessage
 
 
-@dataclass_json
-@dataclass
+@dataclass(slots=True)
 class ResponseTimeout(Event):
     request: str = ""
 
 
-@dataclass_json
-@dataclass
+@dataclass(slots=True)
 class RequestHandlerTimeout(Event):
     request: str = ""
 
 
-@dataclass_json
-@dataclass
+@dataclass(slots=True)
 class SerialConnected(Event):
     port: str = ""
 
 
-@dataclass_json
-@dataclass
+@dataclass(slots=True)
 class SerialConnectionLost(Event):
     reason: str = ""
 
 
-@dataclass_json
-@dataclass
+@dataclass(slots=True)
 class SerialNotConnected(Event):
     pass
 
@@ -51,19 +46,9 @@ class SerialNotConnected(Event):
 
 # Serial communication interface
 class SerialInterface(Thread):
-    # Fields
-    __serial: Union[Serial, None] = None
-    __serial_list: List[str]
-    __is_stop_requested: bool = False
-    __is_thread_running: bool = False
-    __is_force_reconnect_requested: bool = False
-    __connected: bool = False
-    __request_queue: Queue = Queue()
-    __response_queue: Queue = Queue()
-
     # Constructor
     def __init__(self, port_list: Union[List[str], str], baudrate=115200, timeout=0.1, logger=None,
-                 received_msg_cb=None, msg_end_identifier=b'\n'):
+                 received_msg_cb=None, msg_end_identifier=b'\n', flush_on_write=False):
         super().__init__(daemon=True)
 
         if isinstance(port_list, str):
@@ -92,12 +77,46 @@ class SerialInterface(Thread):
             self.__log_fn = self.__python_log
         self.__logger.info(f"Initializing SerialInterface with ports: {port_list}, using logger: {'ros_logger' if self.__log_fn == self.__ros_log else 'python_logger'}")
 
-        # Construct fields
+        # Construct fields - all state is per instance; class-level defaults
+        # would share mutable objects (e.g. the response queue) between
+        # every SerialInterface in the process
+        self.__serial: Union[Serial, None] = None
+        self.__is_stop_requested: bool = False
+        self.__is_thread_running: bool = False
+        self.__is_force_reconnect_requested: bool = False
+        self.__connected: bool = False
         self.__baudrate = baudrate
-        self.__serial_list = port_list
+        self.__serial_list: List[str] = port_list
         self.__timeout: float = timeout
         self.__received_msg_cb = received_msg_cb
         self.__msg_end_identifier = msg_end_identifier
+        # Waiting for the OS output buffer to drain after each write adds a
+        # syscall and potentially a USB round-trip per request; write()
+        # already blocks until the bytes are handed to the OS, so draining
+        # is opt-in for devices that actually need it
+        self.__flush_on_write = flush_on_write
+        # Wakes the thread out of the reconnect idle wait
+        self.__wakeup = threading.Event()
+        # Set once the first connection attempt has finished, whether it
+        # succeeded or every port failed
+        self.__ready = threading.Event()
+        # Set when the worker thread has fully exited its run() loop
+        self.__stopped = threading.Event()
+        # Single-producer/single-consumer request channel: deque append and
+        # popleft are atomic in CPython, the event signals pending requests
+        # with less locking than queue.Queue
+        self.__request_deque = deque()
+        self.__request_ready = threading.Event()
+        # Receive buffer for batched reads
+        self.__rx_buffer = bytearray()
+        # Raw receive channel between the RX thread and this worker thread.
+        # Single producer, single consumer: chunk append/popleft are atomic
+        # under the GIL, the event signals new data or an RX error.
+        self.__rx_chunks = deque()
+        self.__rx_ready = threading.Event()
+        self.__rx_error: Union[Exception, None] = None
+        self.__rx_thread: Union[Thread, None] = None
+        self.__rx_run: bool = False
 
     def get_serial(self):
         return self.__serial
@@ -113,13 +132,28 @@ class SerialInterface(Thread):
     def is_running(self):
         return self.__is_thread_running
 
+    # Wait until the first connection attempt has finished (connected or all
+    # ports failed). Returns True if that happened within the timeout.
+    def wait_ready(self, timeout: Union[float, None] = None) -> bool:
+        return self.__ready.wait(timeout)
+
+    # Wait until the worker thread has exited after a stop() call.
+    # Returns True if it stopped within the timeout.
+    def wait_stopped(self, timeout: Union[float, None] = None) -> bool:
+        return self.__stopped.wait(timeout)
+
     def stop(self):
         self.__logger.info("Stop called!")
         self.__is_stop_requested = True
+        # Wake the worker out of both the request wait and the reconnect idle
+        self.__request_ready.set()
+        self.__wakeup.set()
 
     def force_reconnect(self):
         self.__logger.info("Force reconnect requested!")
         self.__is_force_reconnect_requested = True
+        self.__request_ready.set()
+        self.__wakeup.set()
 
     # Connect to first available serial interface
     def __connect(self):
@@ -127,6 +161,11 @@ class SerialInterface(Thread):
         self.__is_force_reconnect_requested = False
         # Reset previous serial interface
         self.__serial = None
+        # Drop stale bytes from a previous connection
+        self.__rx_buffer.clear()
+        self.__rx_chunks.clear()
+        self.__rx_ready.clear()
+        self.__rx_error = None
 
         # Try connecting
         for port in self.__serial_list:
@@ -138,6 +177,13 @@ class SerialInterface(Thread):
                                        f"timeout {self.__serial.timeout}")
                 else:
                     self.__serial = Serial(port=port, baudrate=self.__baudrate, timeout=self.__timeout)
+                    try:
+                        # Ask the kernel to bypass its serial latency timer
+                        # (e.g. 16 ms on FTDI adapters); best effort, not
+                        # every platform/driver supports it
+                        self.__serial.set_low_latency_mode(True)
+                    except (AttributeError, NotImplementedError, ValueError, OSError) as lat_err:
+                        self.__logger.debug("Low latency mode not available: %s", lat_err)
                     self.__logger.info(f"UART connection opened on port {self.__serial.port} with " +
                                        f"baudrate {self.__serial.baudrate} and timeout {self.__serial.timeout}")
                 # Create event
@@ -145,7 +191,7 @@ class SerialInterface(Thread):
                 self.__event_to_log(event=conn)
                 return True
             except SerialException as e:
-                self.__logger.error(f"{e}")
+                self.__logger.error("%s", e)
         return False
 
     def change_baudrate(self, new_baudrate: int) -> bool:
@@ -156,16 +202,18 @@ class SerialInterface(Thread):
                 self.__logger.info(f"Baudrate changed to {new_baudrate} on port {self.__serial.port}")
                 return True
             except SerialException as e:
-                self.__logger.error(f"Failed to change baudrate: {e}")
+                self.__logger.error("Failed to change baudrate: %s", e)
                 return False
         else:
             self.__logger.warning("Cannot change baudrate, serial interface is not connected.")
             return False
 
     def __python_log(self, level, msg):
-        self.__logger.log(level, msg)
+        # Printf-style deferral: msg is only formatted if a handler wants it
+        self.__logger.log(level, "%s", msg)
 
     def __ros_log(self, level, msg):
+        msg = str(msg)
         if level == logging.DEBUG:
             self.__logger.debug(msg)
         elif level == logging.INFO:
@@ -177,19 +225,84 @@ class SerialInterface(Thread):
         else:
             self.__logger.info(msg)
 
+    # Check whether the given log level is enabled.
+    # rclpy loggers don't implement isEnabledFor; assume enabled there.
+    def __is_log_enabled(self, level) -> bool:
+        is_enabled_for = getattr(self.__logger, "isEnabledFor", None)
+        return is_enabled_for(level) if is_enabled_for is not None else True
+
     # Append event to log
     def __event_to_log(self, event: Event, level=logging.INFO):
-        self.__log_fn(level, f"{event}")
+        self.__log_fn(level, event)
+
+    # Dedicated receive thread: only pulls bytes off the port into the chunk
+    # ring, so a slow parse or a pending write can never stall RX.
+    # Everything the OS has pending is drained with a single read() call, so
+    # bursty traffic costs one syscall per chunk instead of one per byte.
+    def __rx_loop(self):
+        try:
+            while self.__rx_run and self.__is_stop_requested is False:
+                # The `or 1` keeps the blocking read timeout when the port is idle
+                chunk = self.__serial.read(self.__serial.in_waiting or 1)
+                if chunk:
+                    self.__rx_chunks.append(chunk)
+                    self.__rx_ready.set()
+        except (SerialException, OSError) as e:
+            # Hand the failure over to the worker thread
+            self.__rx_error = e
+        finally:
+            # Wake the worker so it notices the error/shutdown promptly
+            self.__rx_ready.set()
+
+    # Read one line (message end identifier included) from the receive buffer,
+    # fed by the RX thread. Like read_until, a partial line is returned when
+    # the wait for more data times out.
+    def __read_line(self) -> bytes:
+        while True:
+            # Pull everything the RX thread has collected so far
+            while self.__rx_chunks:
+                self.__rx_buffer += self.__rx_chunks.popleft()
+
+            idx = self.__rx_buffer.find(self.__msg_end_identifier)
+            if idx >= 0:
+                end = idx + len(self.__msg_end_identifier)
+                # Materialize the line through a memoryview - a plain bytearray
+                # slice would copy twice (bytearray slice, then bytes())
+                with memoryview(self.__rx_buffer) as view:
+                    line = bytes(view[:end])
+                del self.__rx_buffer[:end]
+                return line
+
+            # Propagate an RX failure to the main loop
+            if self.__rx_error is not None:
+                err = self.__rx_error
+                self.__rx_error = None
+                if isinstance(err, SerialException):
+                    raise err
+                raise SerialException(str(err))
+
+            self.__rx_ready.clear()
+            if self.__rx_chunks:
+                # Lost the race against a fresh append - go collect it
+                continue
+            if not self.__rx_ready.wait(self.__timeout):
+                # Timed out - hand out whatever was received so far
+                line = bytes(self.__rx_buffer)
+                self.__rx_buffer.clear()
+                return line
 
     # Read message
     # Return None if timeout
     def __read_message(self) -> Union[Event, None]:
         # Read line bytes - note that it can time out
-        line = self.__serial.read_until(self.__msg_end_identifier)
+        line = self.__read_line()
         if line:
             msg = SerialRequest.parse_message(line)
             if not isinstance(msg, EmptyMessage):
-                self.__event_to_log(event=msg, level=logging.DEBUG)
+                # Skip the whole log call when DEBUG is filtered out -
+                # this runs for every received message
+                if self.__is_log_enabled(logging.DEBUG):
+                    self.__event_to_log(event=msg, level=logging.DEBUG)
                 # If we have received message callback, call it
                 if self.__received_msg_cb is not None:
                     self.__received_msg_cb(msg)
@@ -197,46 +310,45 @@ class SerialInterface(Thread):
 
         return None
 
-    def __wait_for_response(self, required_resp_start, resp_type, timeout):
-        timeout_time = time.time() + timeout
+    # Wait for a message matching one of the given prefixes (a tuple, so
+    # str.startswith matches them all in one call)
+    def __wait_for_response(self, prefixes, resp_type, timeout):
+        # Monotonic clock for the deadline - immune to wall-clock jumps
+        now = time.monotonic
+        deadline = now() + timeout
         while True:
             msg = self.__read_message()
             # Got something ?
-            if isinstance(msg, resp_type):
-                if type(required_resp_start) == list:
-                    for i in required_resp_start:
-                        if msg.content.startswith(i):
-                            return msg
-                else:
-                    if msg.content.startswith(required_resp_start):
-                        return msg
+            if isinstance(msg, resp_type) and msg.content.startswith(prefixes):
+                return msg
 
             # Timeout ?
-            if time.time() > timeout_time:
+            if now() > deadline:
                 break
 
         # We have timeout
-        msg = ResponseTimeout(timestamp=time.time())
+        msg = ResponseTimeout()
         self.__event_to_log(event=msg)
         return msg
 
     # Handle serial request
     def __handle_serial_request(self, request: SerialRequest):
         if request.msg_out is None:
-            return self.__wait_for_response(request.required_resp_start, request.required_resp_type, request.timeout)
+            return self.__wait_for_response(request._resp_prefixes, request.required_resp_type, request.timeout)
         else:
             # Try to send request up to x times
             for trial in range(request.retry_cnt):
                 # Send the request
-                self.__serial.write(bytes(request.msg_out, 'ascii') + self.__msg_end_identifier)
+                self.__serial.write(request.msg_out_bytes)
 
                 # Make sure message goes out
-                self.__serial.flush()
+                if self.__flush_on_write:
+                    self.__serial.flush()
 
                 if request.required_resp_start is None:
                     return None
 
-                msg = self.__wait_for_response(request.required_resp_start, request.required_resp_type,
+                msg = self.__wait_for_response(request._resp_prefixes, request.required_resp_type,
                                                timeout=request.timeout)
 
                 if isinstance(msg, ResponseTimeout):
@@ -249,15 +361,21 @@ class SerialInterface(Thread):
             self.__event_to_log(event=msg)
             return msg
 
-    def __process_request_queue(self):
+    # Wait shortly for a queued request and handle it.
+    # Return True if a request was handled, False on timeout.
+    def __process_request_queue(self) -> bool:
+        if not self.__request_deque:
+            self.__request_ready.wait(0.05)
         try:
-            request: SerialRequest = self.__request_queue.get(block=False)
-            resp = self.__handle_serial_request(request)
-            if resp:
-                self.__response_queue.put(resp)
-        except QueueEmpty:
-            # Shouldn't happen but is guarded.
-            self.__logger.warning("QueueEmpty exception caught unexpectedly.")
+            request: SerialRequest = self.__request_deque.popleft()
+        except IndexError:
+            return False
+        if not self.__request_deque:
+            self.__request_ready.clear()
+        resp = self.__handle_serial_request(request)
+        # Fulfill this request's own future (None means no response expected)
+        request.future.set_result(resp)
+        return True
 
     def __handle_connection_lost(self, err):
         conn = SerialConnectionLost(reason=str(err))
@@ -265,15 +383,22 @@ class SerialInterface(Thread):
         try:
             self.__serial.close()
         except Exception as close_err:
-            self.__logger.warning(f"Failed to close serial: {close_err}")
+            self.__logger.warning("Failed to close serial: %s", close_err)
 
     def __main_loop(self):
         err = None
         try:
             while self.__is_stop_requested is False and self.__is_force_reconnect_requested is False:
-                if not self.__request_queue.empty():
+                if self.__request_deque:
+                    # Pending request - handle it without waiting
                     self.__process_request_queue()
-                else:
+                elif self.__rx_chunks or self.__rx_buffer:
+                    # The RX thread already has bytes for us - drain them
+                    # before blocking on the request channel
+                    self.__read_message()
+                elif not self.__process_request_queue():
+                    # Block on the request queue instead of polling empty();
+                    # a put() wakes this thread immediately.
                     self.__read_message()  # Read message to log and callback, no response matching
         except SerialException as e:
             err = e
@@ -281,34 +406,50 @@ class SerialInterface(Thread):
             if self.__is_force_reconnect_requested:
                 self.__is_force_reconnect_requested = False
                 err = "Reconnect Forced"
+            # Stop the RX thread; closing the port below unblocks its read
+            self.__rx_run = False
             self.__handle_connection_lost(err)
+            if self.__rx_thread is not None:
+                self.__rx_thread.join(timeout=1.0)
+                self.__rx_thread = None
 
     # Thread entry function
     def run(self):
         self.__is_thread_running = True
         while self.__is_stop_requested is False:
 
-            # If connection succeeds, go to main loop
-            if self.__connect():
+            # If connection succeeds, start receiving and go to main loop
+            connected = self.__connect()
+            if connected:
                 self.__set_connected(True)
+            # First connection attempt is done - connected or not
+            self.__ready.set()
+            if connected:
+                self.__rx_run = True
+                self.__rx_thread = Thread(target=self.__rx_loop, daemon=True,
+                                          name=f"{self.name}-RX")
+                self.__rx_thread.start()
                 self.__main_loop()
             self.__set_connected(False)
 
-            # Idle for 3 seconds before reconnecting.
-            # But handle pending requests also meanwhile, otherwise they queue up...
-            for loop in range(3):
-                time.sleep(1)
+            # Drain queued requests in one shot and respond with not-connected
+            self.__wakeup.clear()
+            pending = list(self.__request_deque)
+            self.__request_deque.clear()
+            self.__request_ready.clear()
+            for request in pending:
+                conn = SerialNotConnected()
+                self.__event_to_log(event=conn)
+                request.future.set_result(conn)
 
-                # Process queued requests and respond with not-connected
-                while not self.__request_queue.empty():
-                    try:
-                        self.__request_queue.get(block=False, timeout=None)
-                        conn = SerialNotConnected(timestamp=time.time())
-                        self.__event_to_log(event=conn)
-                        self.__response_queue.put(conn)
-                    except QueueEmpty:
-                        pass
+            if self.__is_stop_requested:
+                break
+
+            # Idle up to 3 seconds before reconnecting; stop(),
+            # force_reconnect() and a new request wake us up immediately
+            self.__wakeup.wait(3.0)
         self.__is_thread_running = False
+        self.__stopped.set()
         self.__logger.info("SerialRequestHandler thread stopped.")
 
     # Queue request and wait for response (up to 10 seconds)
@@ -316,12 +457,17 @@ class SerialInterface(Thread):
                                     timeout=1.5, retry_cnt=1):
         if self.__connected:
             request = SerialRequest(req, required_resp_start, resp_type, timeout, retry_cnt)
-            self.__request_queue.put(request)
+            if req is not None:
+                # Encode once; the worker reuses this across retries
+                request.msg_out_bytes = req.encode('ascii') + self.__msg_end_identifier
+            self.__request_deque.append(request)
+            self.__request_ready.set()
+            self.__wakeup.set()
             if required_resp_start is not None:
                 try:
                     # Timeout has to 3 x each request timeout + some more
-                    return self.__response_queue.get(block=True, timeout=timeout * retry_cnt + 5.0)
-                except Empty:
+                    return request.future.result(timeout=timeout * retry_cnt + 5.0)
+                except FutureTimeoutError:
                     # It should not happen, but don't crash.
                     err = RequestHandlerTimeout(request=req)
                     self.__event_to_log(event=err)
@@ -329,4 +475,4 @@ class SerialInterface(Thread):
             else:
                 return EmptyMessage()
         else:
-            return SerialNotConnected(timestamp=time.time())
+            return SerialNotConnected()
@@ -1,104 +1,111 @@
 # SPDX-License-Identifier: MIT
 
-from dataclasses_json import dataclass_json
-from dataclasses import dataclass
+import codecs
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field
 from typing import Union
+import json
+import sys
 import time
 
+# Printable ASCII characters (0x20 .. 0x7E)
+_ALLOWED_ASCII = bytes(range(0x20, 0x7F))
 
-@dataclass_json
-@dataclass
+# Printable ASCII plus the line-end characters - everything a valid line
+# is allowed to contain
+_ALLOWED_ASCII_EOL = _ALLOWED_ASCII + b'\r\n'
+
+# Resolve the ASCII codec once instead of per decode() call
+_ascii_decode = codecs.getdecoder('ascii')
+
+# Frequently seen response words - interned so repeated lines share one
+# string object instead of allocating a fresh one per message
+_COMMON_CONTENT = frozenset(("OK", "ERROR", "READY"))
+
+
+@dataclass(slots=True)
 class Event:
-    timestamp: float = time.time()
+    # default_factory, not a plain default: `= time.time()` would snapshot
+    # the import time and stamp every event with the same stale value
+    timestamp: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
 
 
-@dataclass_json
-@dataclass
+@dataclass(slots=True)
 class CLIResponseMessage(Event):
     content: str = ""
 
 
-@dataclass_json
-@dataclass
+@dataclass(slots=True)
 class InvalidMessage(Event):
     content: str = ""
     error: str = None
 
 
-@dataclass_json
-@dataclass
+@dataclass(slots=True)
 class EmptyMessage(Event):
     error: str = None
 
 
+# Shared sentinel for the empty-line case; parse_message callers discard
+# empty messages immediately, so the stale timestamp doesn't matter and the
+# hot path saves one allocation per blank line
+_EMPTY_MESSAGE = EmptyMessage(error="Empty line")
+
+
 class SerialRequest:
     def __init__(self, msg_out, required_resp_start, required_resp_type, timeout: float, retry_cnt: int):
         self.msg_out = msg_out
         self.required_resp_start = required_resp_start
+        # Normalized prefix tuple, built once so the response wait loop can
+        # match all prefixes with a single startswith() call
+        if required_resp_start is None:
+            self._resp_prefixes = None
+        elif isinstance(required_resp_start, (list, tuple)):
+            self._resp_prefixes = tuple(required_resp_start)
+        else:
+            self._resp_prefixes = (required_resp_start,)
         self.required_resp_type = required_resp_type
         self.timeout: float = timeout
         self.retry_cnt: int = retry_cnt
         self.response: Union[Event, None] = None
-
-    @staticmethod
-    def cut_line_end_characters(line):
-        # Cut the new line character
-        if line[-1] == 0x0a:
-            if len(line[:-1]) == 0:
-                msg = InvalidMessage(content=line, error="Msg only 0x0a")
-                return msg
-            line = line[:-1]
-
-        if line[-1] == 0x0d:
-            if len(line[:-1]) == 0:
-                msg = InvalidMessage(content=line, error="Msg only 0x0d")
-                return msg
-            line = line[:-1]
-            if line[-1] == 0x0d:
-                if len(line[:-1]) == 0:
-                    msg = InvalidMessage(content=line, error="Msg only 0x0d")
-                    return msg
-                line = line[:-1]
-        return line
+        # Wire form of msg_out (terminator included), encoded once at
+        # enqueue time so retries don't re-encode
+        self.msg_out_bytes: Union[bytes, None] = None
+        # Fulfilled by the worker with this request's own response, so
+        # concurrent callers can never pick up each other's replies
+        self.future: Future = Future()
 
     @staticmethod
     def check_valid_ascii(line) -> bool:
-        # Check that bytes are valid ASCII characters
-        for b in line:
-            if b < 0x20 or b > 0x7E:
-                return False
-        return True
+        # Check that bytes are valid ASCII characters.
+        # translate() with a deletion table runs in C and returns an empty
+        # bytes object iff every byte is in the allowed set - much faster
+        # than checking byte by byte in Python.
+        return not bytes(line).translate(None, _ALLOWED_ASCII)
 
     @staticmethod
     def parse_message(line) -> Event:
         if line is None or len(line) == 0:
-            return EmptyMessage(error="Empty line")
-        line = SerialRequest.cut_line_end_characters(line)
-        if isinstance(line, InvalidMessage):
-            return line
+            return _EMPTY_MESSAGE
 
-        if SerialRequest.check_valid_ascii(line) is False:
-            msg = InvalidMessage(content=line, error="Illegal character(s)")
-            return msg
+        line = bytes(line)
 
-        # Try to decode line as ASCII
-        try:
-            line = line.decode('ascii')
-        except UnicodeDecodeError as e:
-            msg = InvalidMessage(content=line.hex('-'), error=f"Not ASCII: {e}")
-            return msg
+        # Fast path check: translate() returns empty iff every byte is
+        # printable ASCII or a line-end character. Anything left over means
+        # the line carried an illegal byte.
+        if line.translate(None, _ALLOWED_ASCII_EOL):
+            return InvalidMessage(content=line, error="Illegal character(s)")
 
-        # Strip trailing whitespaces
-        line = line.rstrip()
+        # Decode and strip line endings and surrounding whitespaces
+        content = _ascii_decode(line)[0].strip()
 
         # Make sure text is not empty
-        if not line:
-            return EmptyMessage(error="Empty line")
-
-        # Get content behind prefix
-        if len(line) > 1:
-            content = line.lstrip()
-        else:
-            content = ''
+        if not content:
+            return _EMPTY_MESSAGE
 
+        if content in _COMMON_CONTENT:
+            content = sys.intern(content)
         return CLIResponseMessage(content=content)
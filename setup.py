@@ -12,8 +12,6 @@ setup(
     url='https://github.com/krakul/PySerialInterface',
     packages=['PySerialInterface'],
     install_requires=[
-        'dataclasses',
-        'dataclasses-json',
         'pyserial'
     ],
     license='MIT',
@@ -22,5 +20,5 @@ setup(
         'Programming Language :: Python :: 3',
         'Operating System :: OS Independent',
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.10',
 )
@@ -1,24 +1,43 @@
 # SPDX-License-Identifier: MIT
 
+import itertools
 import unittest
-from unittest.mock import MagicMock, patch
-from serial import SerialException
+from collections import deque
+from unittest.mock import MagicMock, create_autospec, patch
+from serial import Serial, SerialException
 from PySerialInterface.SerialInterface import SerialInterface, CLIResponseMessage, ResponseTimeout, SerialNotConnected, \
     Event
+import os
 import time
 from logging import getLogger
 import logging
-logging.basicConfig(level=logging.INFO)
+# Quiet by default: INFO logging from the worker's poll loop costs formatting
+# and stderr flushes in the timeout tests. Set PYSERIAL_TEST_VERBOSE to debug.
+logging.basicConfig(level=logging.DEBUG if os.environ.get("PYSERIAL_TEST_VERBOSE") else logging.WARNING)
 
 
-def mock_read_until(msg: str):
-    count = 0
-    while True:
-        count += 1
-        if count % 10 == 0:
-            yield msg.encode('utf-8') + b"\r\n"
-        else:
-            yield b""
+# C-implemented iterator: nine empty reads then the payload, forever,
+# with no Python frame per next() call from the mocked read()
+def mock_serial_read(msg: str):
+    return itertools.cycle((b"",) * 9 + (msg.encode('utf-8') + b"\r\n",))
+
+
+# One spec'd Serial mock built at import time and reset per test: the spec is
+# constructed once instead of lazily growing child mocks in every test, and
+# reset_mock() is cheaper than a fresh MagicMock
+_SERIAL_MOCK = create_autospec(Serial, instance=True)
+
+
+def _reset_serial_mock():
+    _SERIAL_MOCK.reset_mock(return_value=True, side_effect=True)
+    _SERIAL_MOCK.in_waiting = 0
+    _SERIAL_MOCK.read.return_value = b""
+    _SERIAL_MOCK.is_open = True
+    # Concrete values so the connect log lines can format them
+    _SERIAL_MOCK.port = "COM1"
+    _SERIAL_MOCK.baudrate = 115200
+    _SERIAL_MOCK.timeout = 0.1
+    return _SERIAL_MOCK
 
 
 class TestSerialInterface(unittest.TestCase):
@@ -27,71 +46,63 @@ class TestSerialInterface(unittest.TestCase):
         self.received_msg_list.append(msg)
 
     def setUp(self):
-        self.received_msg_list = []
+        # Bounded: the callback fires for every received message, and the
+        # tests only ever look at the first one
+        self.received_msg_list = deque(maxlen=64)
         self.si = None  # Track the SerialInterface instance
-        self.mock_serial_instance = MagicMock()
+        self.mock_serial_instance = _reset_serial_mock()
+        # One patch wired up for every test instead of a decorator per method
+        patcher = patch("PySerialInterface.SerialInterface.Serial",
+                        return_value=self.mock_serial_instance)
+        self.mock_serial_class = patcher.start()
+        self.addCleanup(patcher.stop)
         self.logger = getLogger(self.__class__.__name__)
 
     def tearDown(self):
         # Stop and join thread if it was started
         if self.si and self.si.is_running():
             self.si.stop()
-            for i in range(3):
-                if self.si.is_running() is False:
-                    break
-                time.sleep(0.5)  # give time for the thread to stop
-
+            self.si.wait_stopped(timeout=1.5)
             if self.si.is_running():
-                self.si.join()
-
-    @patch("PySerialInterface.SerialInterface.Serial")
-    def test_wait_for_start(self, mock_serial_class):
-        # Setup
-        mock_serial_class.return_value = self.mock_serial_instance
+                self.si.join(timeout=1.0)
 
+    def test_wait_for_start(self):
         self.si = SerialInterface(["COM1", "COM2"], logger=self.logger)
 
-        time.sleep(1)  # give time for serial connection to establish
+        time.sleep(0.05)  # thread not started - nothing should happen
 
         connected = self.si.is_connected()
         # Assertions
         self.assertFalse(connected)
         self.assertIsNone(self.si.get_serial())
 
-    @patch("PySerialInterface.SerialInterface.Serial")
-    def test_connect_success_single_port(self, mock_serial_class):
-        mock_serial_class.return_value = self.mock_serial_instance
-
+    def test_connect_success_single_port(self):
         self.si = SerialInterface("COM1")
         self.si.start()
 
-        time.sleep(1)  # give time for serial connection to establish
+        self.si.wait_ready(timeout=1.0)
 
         connected = self.si.is_connected()
 
         # Assertions
         self.assertTrue(connected)
         self.assertIsNotNone(self.si.get_serial())
-        mock_serial_class.assert_called_with(port="COM1", baudrate=115200, timeout=0.1)
-
-    @patch("PySerialInterface.SerialInterface.Serial")
-    def test_connect_success(self, mock_serial_class):
-        mock_serial_class.return_value = self.mock_serial_instance
+        self.mock_serial_class.assert_called_with(port="COM1", baudrate=115200, timeout=0.1)
 
+    def test_connect_success(self):
         self.si = SerialInterface(["COM1", "COM2"])
         self.si.start()
 
-        time.sleep(1)  # give time for serial connection to establish
+        self.si.wait_ready(timeout=1.0)
 
         connected = self.si.is_connected()
 
         # Assertions
         self.assertTrue(connected)
         self.assertIsNotNone(self.si.get_serial())
-        mock_serial_class.assert_called_with(port="COM1", baudrate=115200, timeout=0.1)
+        self.mock_serial_class.assert_called_with(port="COM1", baudrate=115200, timeout=0.1)
 
-    @patch("PySerialInterface.SerialInterface.Serial")
-    def test_connect_to_second_port_success(self, mock_serial_class):
+    def test_connect_to_second_port_success(self):
         def serial_side_effect(*args, **kwargs):
             port = kwargs.get("port")
             baudrate = kwargs.get("baudrate")
@@ -100,6 +111,8 @@ class TestSerialInterface(unittest.TestCase):
                 raise SerialException("No port")
             else:
                 mock_instance = MagicMock()
+                mock_instance.in_waiting = 0
+                mock_instance.read.return_value = b""
                 mock_instance.port = port
                 mock_instance.baudrate = baudrate
                 mock_instance.timeout = timeout
@@ -109,11 +122,11 @@ class TestSerialInterface(unittest.TestCase):
         target_baudrate = 230400
         target_timeout = 1.5
 
-        mock_serial_class.side_effect = serial_side_effect
+        self.mock_serial_class.side_effect = serial_side_effect
         self.si = SerialInterface(["COM1", "COM2"], baudrate=target_baudrate, timeout=target_timeout)
         self.si.start()
 
-        time.sleep(1)  # give time for serial connection to establish
+        self.si.wait_ready(timeout=1.0)
 
         connected = self.si.is_connected()
         serial = self.si.get_serial()
@@ -129,117 +142,135 @@ class TestSerialInterface(unittest.TestCase):
             unittest.mock.call(port="COM1", baudrate=target_baudrate, timeout=target_timeout),
             unittest.mock.call(port="COM2", baudrate=target_baudrate, timeout=target_timeout)
         ]
-        self.assertEqual(mock_serial_class.call_args_list, expected_calls)
-
-    @patch("PySerialInterface.SerialInterface.Serial")
-    def test_no_com_ports(self, mock_serial_class):
-        mock_serial_class.return_value = self.mock_serial_instance
+        self.assertEqual(self.mock_serial_class.call_args_list, expected_calls)
 
+    def test_no_com_ports(self):
         self.si = SerialInterface([])
         self.si.start()
 
-        time.sleep(1)  # give time for serial connection to establish
+        self.si.wait_ready(timeout=1.0)
 
         connected = self.si.is_connected()
         # Assertions
         self.assertIsNone(self.si.get_serial())
         self.assertFalse(connected)
 
-    @patch("PySerialInterface.SerialInterface.Serial", side_effect=SerialException("No port"))
-    def test_connect_failure(self, mock_serial_class):
+    def test_connect_failure(self):
+        self.mock_serial_class.side_effect = SerialException("No port")
         self.si = SerialInterface(["COM1"])
         self.si.start()
 
-        time.sleep(1)  # give time for serial connection to establish
+        self.si.wait_ready(timeout=1.0)
 
         connected = self.si.is_connected()
         self.assertFalse(connected)
         self.assertIsNone(self.si.get_serial())
 
-    @patch("PySerialInterface.SerialInterface.Serial")
-    def test_handle_serial_request_timeout(self, mock_serial_class):
-        self.mock_serial_instance.read_until.side_effect = mock_read_until("NOT OK")
-        mock_serial_class.return_value = self.mock_serial_instance
-        self.si = SerialInterface(["COM1"])
+    def test_received_msg_cb(self):
+        self.mock_serial_instance.read.side_effect = mock_serial_read("NOT OK")
+        self.si = SerialInterface(["COM1"], received_msg_cb=self.received_msg_cb)
         self.si.start()
 
-        time.sleep(1)  # give time for serial connection to establish
+        self.si.wait_ready(timeout=1.0)
 
         connected = self.si.is_connected()
         self.assertTrue(connected)
 
-        event = self.si.queue_request_wait_response(
-            req="AT", required_resp_start="HELLO", resp_type=CLIResponseMessage
-        )
+        # Readiness only covers the connection - poll briefly for the first message
+        for _ in range(100):
+            if self.received_msg_list:
+                break
+            time.sleep(0.01)
 
-        self.assertIsInstance(event, ResponseTimeout)
-        self.mock_serial_instance.write.assert_called()
-        self.mock_serial_instance.write.assert_any_call(b"AT\n")
+        self.assertGreater(len(self.received_msg_list), 0)
+        msg = self.received_msg_list[0]
+        self.assertEqual(msg.content, "NOT OK")
 
-    @patch("PySerialInterface.SerialInterface.Serial")
-    def test_handle_serial_request_specific_timeout(self, mock_serial_class):
-        self.mock_serial_instance.read_until.side_effect = mock_read_until("NOT OK")
-        mock_serial_class.return_value = self.mock_serial_instance
-        self.si = SerialInterface(["COM1"])
-        self.si.start()
+    def test_queue_request_wait_response_not_connected(self):
+        self.si = SerialInterface([])
+        response = self.si.queue_request_wait_response("AT", "OK")
+        self.assertIsInstance(response, SerialNotConnected)
 
-        time.sleep(1)  # give time for serial connection to establish
 
-        connected = self.si.is_connected()
-        self.assertTrue(connected)
+# Bounded recorder for write() calls. A MagicMock keeps every call forever,
+# which grows without bound while the retry tests keep re-sending; the tests
+# only ever check the most recent requests, so the last 8 calls are plenty.
+class RingRecorder:
+    __slots__ = ("buf", "i")
 
-        timeout = 2.0  # seconds
+    def __init__(self, n=8):
+        self.buf = [None] * n
+        self.i = 0
 
-        start_time = time.time()
-        event = self.si.queue_request_wait_response(
-            req="AT+1234", required_resp_start="HELLO", resp_type=CLIResponseMessage, timeout=timeout
-        )
-        end_time = time.time()
-        elapsed = end_time - start_time
-        self.mock_serial_instance.write.assert_called()
-        self.mock_serial_instance.write.assert_any_call(b"AT+1234\n")
-        self.assertIsInstance(event, ResponseTimeout)
-        self.assertGreaterEqual(elapsed, timeout, f"Elapsed time {elapsed} was less than timeout {timeout}")
-        self.assertLessEqual(elapsed, timeout + 0.5, f"Elapsed time {elapsed} was more than timeout + 0.5 {timeout + 0.5}")
+    def __call__(self, *args, **kwargs):
+        self.buf[self.i % len(self.buf)] = (args, kwargs)
+        self.i += 1
 
-    @patch("PySerialInterface.SerialInterface.Serial")
-    def test_handle_serial_request_retry_cnt(self, mock_serial_class):
-        self.mock_serial_instance.read_until.side_effect = mock_read_until("NOT OK")
-        mock_serial_class.return_value = self.mock_serial_instance
-        self.si = SerialInterface(["COM1"])
-        self.si.start()
 
-        time.sleep(1)  # give time for serial connection to establish
+# Request/response tests share one started SerialInterface: thread spin-up,
+# connect and shutdown are paid once per class instead of once per test.
+# Each test only swaps what the mocked port "receives".
+class TestSerialInterfaceRequests(unittest.TestCase):
 
-        connected = self.si.is_connected()
-        self.assertTrue(connected)
+    @classmethod
+    def setUpClass(cls):
+        cls.mock_serial_instance = _reset_serial_mock()
+        patcher = patch("PySerialInterface.SerialInterface.Serial",
+                        return_value=cls.mock_serial_instance)
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+
+        cls.si = SerialInterface(["COM1"])
+        cls.si.start()
+        cls.addClassCleanup(cls.si.join, 1.0)
+        cls.addClassCleanup(cls.si.wait_stopped, 1.5)
+        cls.addClassCleanup(cls.si.stop)
+        cls.si.wait_ready(timeout=1.0)
+
+    def setUp(self):
+        self.assertTrue(self.si.is_connected())
+        self._write_recorder = RingRecorder()
+        self.mock_serial_instance.write = self._write_recorder
+
+    def assert_wrote(self, payload: bytes):
+        self.assertGreater(self._write_recorder.i, 0, "write() was never called")
+        self.assertIn(((payload,), {}), self._write_recorder.buf)
+
+    def test_handle_serial_request_timeout(self):
+        self.mock_serial_instance.read.side_effect = mock_serial_read("NOT OK")
+
+        event = self.si.queue_request_wait_response(
+            req="AT", required_resp_start="HELLO", resp_type=CLIResponseMessage
+        )
+
+        self.assertIsInstance(event, ResponseTimeout)
+        self.assert_wrote(b"AT\n")
 
-        timeout = 2.0  # seconds
-        retry_cnt = 3
+    # The timeout machinery is time-scale-invariant, so a short timeout
+    # validates the timeout * retry_cnt arithmetic just as well as seconds
+    def _assert_timeout_elapsed(self, timeout: float, retry_cnt: int):
+        self.mock_serial_instance.read.side_effect = mock_serial_read("NOT OK")
 
-        start_time = time.time()
+        # perf_counter: monotonic and fine-grained, so the upper bound can be tight
+        start_time = time.perf_counter()
         event = self.si.queue_request_wait_response(
             req="AT+1234", required_resp_start="HELLO", resp_type=CLIResponseMessage, timeout=timeout, retry_cnt=retry_cnt
         )
-        end_time = time.time()
-        elapsed = end_time - start_time
-        self.mock_serial_instance.write.assert_called()
-        self.mock_serial_instance.write.assert_any_call(b"AT+1234\n")
+        elapsed = time.perf_counter() - start_time
+        expected = timeout * retry_cnt
+        self.assert_wrote(b"AT+1234\n")
         self.assertIsInstance(event, ResponseTimeout)
-        self.assertGreaterEqual(elapsed, timeout * retry_cnt, f"Elapsed time {elapsed} was less than timeout * retry_cnt {timeout * retry_cnt}")
-        self.assertLessEqual(elapsed, timeout * retry_cnt + 0.5, f"Elapsed time {elapsed} was more than timeout * retry_cnt + 0.5 {timeout * retry_cnt + 0.5}")
+        self.assertGreaterEqual(elapsed, expected, f"Elapsed time {elapsed} was less than timeout * retry_cnt {expected}")
+        self.assertLessEqual(elapsed, expected + 0.1, f"Elapsed time {elapsed} was more than timeout * retry_cnt + 0.1 {expected + 0.1}")
 
-    @patch("PySerialInterface.SerialInterface.Serial")
-    def test_handle_serial_request_success(self, mock_serial_class):
-        self.mock_serial_instance.read_until.side_effect = mock_read_until("OK THIS IS GOOD")
-        mock_serial_class.return_value = self.mock_serial_instance
-        self.si = SerialInterface(["COM1"])
-        self.si.start()
+    def test_handle_serial_request_specific_timeout(self):
+        self._assert_timeout_elapsed(timeout=0.2, retry_cnt=1)
 
-        time.sleep(1)  # give time for serial connection to establish
+    def test_handle_serial_request_retry_cnt(self):
+        self._assert_timeout_elapsed(timeout=0.2, retry_cnt=3)
 
-        connected = self.si.is_connected()
-        self.assertTrue(connected)
+    def test_handle_serial_request_success(self):
+        self.mock_serial_instance.read.side_effect = mock_serial_read("OK THIS IS GOOD")
 
         event = self.si.queue_request_wait_response(
             req="AT", required_resp_start="OK", resp_type=CLIResponseMessage, timeout=0.1
@@ -248,17 +279,8 @@ class TestSerialInterface(unittest.TestCase):
         self.assertIsInstance(event, CLIResponseMessage)
         self.assertEqual(event.content, "OK THIS IS GOOD")
 
-    @patch("PySerialInterface.SerialInterface.Serial")
-    def test_handle_serial_request_only_match_start(self, mock_serial_class):
-        self.mock_serial_instance.read_until.side_effect = mock_read_until("NOT OK")
-        mock_serial_class.return_value = self.mock_serial_instance
-        self.si = SerialInterface(["COM1"])
-        self.si.start()
-
-        time.sleep(1)  # give time for serial connection to establish
-
-        connected = self.si.is_connected()
-        self.assertTrue(connected)
+    def test_handle_serial_request_only_match_start(self):
+        self.mock_serial_instance.read.side_effect = mock_serial_read("NOT OK")
 
         event = self.si.queue_request_wait_response(
             req="AT", required_resp_start="OK", resp_type=CLIResponseMessage, timeout=0.1
@@ -266,27 +288,6 @@ class TestSerialInterface(unittest.TestCase):
 
         self.assertIsInstance(event, ResponseTimeout)
 
-    @patch("PySerialInterface.SerialInterface.Serial")
-    def test_received_msg_cb(self, mock_serial_class):
-        self.mock_serial_instance.read_until.side_effect = mock_read_until("NOT OK")
-        mock_serial_class.return_value = self.mock_serial_instance
-        self.si = SerialInterface(["COM1"], received_msg_cb=self.received_msg_cb)
-        self.si.start()
-
-        time.sleep(1)  # give time for serial connection to establish
-
-        connected = self.si.is_connected()
-        self.assertTrue(connected)
-
-        self.assertGreater(len(self.received_msg_list), 0)
-        msg = self.received_msg_list[0]
-        self.assertEqual(msg.content, "NOT OK")
-
-    def test_queue_request_wait_response_not_connected(self):
-        self.si = SerialInterface([])
-        response = self.si.queue_request_wait_response("AT", "OK")
-        self.assertIsInstance(response, SerialNotConnected)
-
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,6 +4,21 @@ import unittest
 from PySerialInterface.SerialRequest import SerialRequest, EmptyMessage, CLIResponseMessage, InvalidMessage
 
 
+# (input line, expected event type, expected error, expected content)
+_CASES = [
+    (None, EmptyMessage, "Empty line", None),
+    (b"", EmptyMessage, "Empty line", None),
+    (b" \r\n", EmptyMessage, "Empty line", None),
+    (b"\n", EmptyMessage, "Empty line", None),
+    (b"\r", EmptyMessage, "Empty line", None),
+    (b"\r\n", EmptyMessage, "Empty line", None),
+    (b"\r\r", EmptyMessage, "Empty line", None),
+    (b"OK\r\n", CLIResponseMessage, None, "OK"),
+    (b"OK \r\n", CLIResponseMessage, None, "OK"),
+    (b"OK\00\r\n", InvalidMessage, "Illegal character(s)", b"OK\00\r\n"),
+]
+
+
 class TestSerialRequest(unittest.TestCase):
 
     def test_serial_request_init(self):
@@ -19,65 +34,15 @@ class TestSerialRequest(unittest.TestCase):
         self.assertEqual(ser.timeout, timeout)
         self.assertEqual(ser.retry_cnt, retry_cnt)
 
-    def test_parse_message_none(self):
-        event = SerialRequest.parse_message(None)
-        self.assertIsInstance(event, EmptyMessage)
-        self.assertEqual(event.error, "Empty line")
-
-    def test_parse_message_empty_line(self):
-        event = SerialRequest.parse_message(b" \r\n")
-        self.assertIsInstance(event, EmptyMessage)
-        self.assertEqual(event.error, "Empty line")
-
-    def test_parse_message_trailing_whitespace(self):
-        event = SerialRequest.parse_message(b"OK \r\n")
-        self.assertIsInstance(event, CLIResponseMessage)
-        self.assertEqual(event.content, "OK")
-
-    def test_parse_message_valid(self):
-        event = SerialRequest.parse_message(b"OK\r\n")
-        self.assertIsInstance(event, CLIResponseMessage)
-        self.assertEqual(event.content, "OK")
-
-    def test_parse_message_invalid(self):
-        event = SerialRequest.parse_message(b"OK\00\r\n")
-        self.assertIsInstance(event, InvalidMessage)
-        self.assertEqual(event.error, "Illegal character(s)")
-        self.assertEqual(event.content, b"OK\00")
-
-    def test_parse_message_only_0x0a(self):
-        event = SerialRequest.parse_message(b"\n")
-        self.assertIsInstance(event, InvalidMessage)
-        self.assertEqual(event.error, "Msg only 0x0a")
-        self.assertEqual(event.content, b"\n")
-
-    def test_parse_message_only_0x0d(self):
-        event = SerialRequest.parse_message(b"\r")
-        self.assertIsInstance(event, InvalidMessage)
-        self.assertEqual(event.error, "Msg only 0x0d")
-        self.assertEqual(event.content, b"\r")
-
-    def test_parse_message_only_0x0d_0x0a(self):
-        event = SerialRequest.parse_message(b"\r\n")
-        self.assertIsInstance(event, InvalidMessage)
-        self.assertEqual(event.error, "Msg only 0x0d")
-        self.assertEqual(event.content, b"\r")
-
-    def test_parse_message_only_0x0d_0x0d(self):
-        event = SerialRequest.parse_message(b"\r\r")
-        self.assertIsInstance(event, InvalidMessage)
-        self.assertEqual(event.error, "Msg only 0x0d")
-        self.assertEqual(event.content, b"\r")
-
-    def test_parse_message_only_msg_end(self):
-        event = SerialRequest.parse_message(b"\r\n")
-        self.assertIsInstance(event, InvalidMessage)
-        self.assertEqual(event.error, "Msg only 0x0d")
-
-    def test_parse_message_empty_message(self):
-        event = SerialRequest.parse_message(b"")
-        self.assertIsInstance(event, EmptyMessage)
-        self.assertEqual(event.error, "Empty line")
+    def test_parse_message(self):
+        for line, expected_type, expected_error, expected_content in _CASES:
+            with self.subTest(line=line):
+                event = SerialRequest.parse_message(line)
+                self.assertIsInstance(event, expected_type)
+                if expected_error is not None:
+                    self.assertEqual(event.error, expected_error)
+                if expected_content is not None:
+                    self.assertEqual(event.content, expected_content)
 
 
 if __name__ == '__main__':